@@ -0,0 +1,51 @@
+"""
+Customer Risk Scoring - Scoring Rules
+Shared by risk_scoring_model.py and streamlit_dashboard.py
+
+Score range: 0-100 (higher = higher risk)
+"""
+
+import numpy as np
+import pandas as pd
+
+PAYMENT_STATUSES = ['Current', 'Late', 'Delinquent']
+RISK_CATEGORIES = ['Low Risk', 'Medium Risk', 'High Risk']
+
+# Payment Status (Weight: 20%); unknown or missing statuses score as Delinquent
+PAYMENT_STATUS_POINTS = {'Current': 5, 'Late': 15, 'Delinquent': 20}
+_STATUS_POINTS_BY_CODE = np.array([PAYMENT_STATUS_POINTS[s] for s in PAYMENT_STATUSES], dtype=np.int8)
+
+def score_frame(df):
+    """Vectorized risk score for every row of the frame"""
+    util = df['credit_utilization'].to_numpy()
+    late = df['late_payment_count'].to_numpy()
+    income = df['income'].to_numpy()
+    missed = df['missed_payment_6m'].to_numpy()
+
+    # 1. Credit Utilization (Weight: 25%)
+    util_pts = np.select([util < 30, util < 60], [5, 15], default=25)
+
+    # 2. Late Payment Count (Weight: 30%)
+    late_pts = np.select([late == 0, late <= 2], [5, 20], default=30)
+
+    # 3. Income Level (Weight: 15%)
+    income_pts = np.select([income >= 10000000, income >= 5000000], [3, 10], default=15)
+
+    # 4. Payment Status (Weight: 20%)
+    status = df['payment_status']
+    if isinstance(status.dtype, pd.CategoricalDtype) and list(status.cat.categories) == PAYMENT_STATUSES:
+        # Gather by category code; a missing status (code -1) picks Delinquent
+        status_pts = _STATUS_POINTS_BY_CODE[status.cat.codes.to_numpy()]
+    else:
+        status_pts = status.map(PAYMENT_STATUS_POINTS).fillna(PAYMENT_STATUS_POINTS['Delinquent']).to_numpy(np.int8)
+
+    # 5. Missed Payments (Weight: 10%)
+    missed_pts = np.select([missed == 0, missed <= 2], [2, 7], default=10)
+
+    total = util_pts + late_pts + income_pts + status_pts + missed_pts
+    return np.minimum(total, 100)  # Cap at 100
+
+def categorize_risk(scores, low=33, high=67):
+    """Categorize integer scores into risk segments (<=low Low, >=high High, else Medium)"""
+    codes = np.searchsorted([low, high - 1], np.asarray(scores), side='left')
+    return pd.Categorical.from_codes(codes, categories=RISK_CATEGORIES, ordered=True)
@@ -12,6 +12,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
+from scoring import PAYMENT_STATUSES, RISK_CATEGORIES, score_frame, categorize_risk
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -56,103 +57,505 @@ st.markdown("""
 # DATA GENERATION FUNCTIONS
 # ============================================================================
 
-@st.cache_data
+EMPLOYMENT_STATUSES = ['Employed', 'Self-employed', 'Unemployed']
+
 def generate_customer_data(n_customers=1000, seed=42):
     """Generate synthetic customer data"""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     data = {
-        'customer_id': [f'CUST{str(i).zfill(5)}' for i in range(1, n_customers + 1)],
-        'age': np.random.randint(21, 65, n_customers),
-        'income': np.random.choice(
+        'customer_id': np.char.add('CUST', np.char.zfill(np.arange(1, n_customers + 1).astype(str), 5)),
+        'age': rng.integers(21, 65, n_customers, dtype=np.int8),
+        'income': rng.choice(
             [3000000, 5000000, 7500000, 10000000, 15000000, 20000000], 
             n_customers, 
             p=[0.20, 0.25, 0.20, 0.15, 0.12, 0.08]
         ),
-        'employment_status': np.random.choice(
-            ['Employed', 'Self-employed', 'Unemployed'], 
-            n_customers, 
-            p=[0.70, 0.25, 0.05]
+        'employment_status': pd.Categorical(
+            rng.choice(EMPLOYMENT_STATUSES, n_customers, p=[0.70, 0.25, 0.05]),
+            categories=EMPLOYMENT_STATUSES
         ),
-        'dependents': np.random.randint(0, 5, n_customers),
-        'credit_limit': np.random.choice(
+        'dependents': rng.integers(0, 5, n_customers, dtype=np.int8),
+        'credit_limit': rng.choice(
             [5000000, 10000000, 15000000, 25000000, 50000000], 
             n_customers,
             p=[0.30, 0.30, 0.20, 0.15, 0.05]
         ),
-        'credit_utilization': np.random.beta(2, 5, n_customers) * 100,
-        'late_payment_count': np.random.poisson(0.5, n_customers),
-        'account_age_months': np.random.randint(6, 120, n_customers),
-        'payment_status': np.random.choice(
-            ['Current', 'Late', 'Delinquent'], 
-            n_customers, 
-            p=[0.75, 0.20, 0.05]
+        'credit_utilization': rng.beta(2, 5, n_customers) * 100,
+        'late_payment_count': rng.poisson(0.5, n_customers),
+        'account_age_months': rng.integers(6, 120, n_customers, dtype=np.int16),
+        'payment_status': pd.Categorical(
+            rng.choice(PAYMENT_STATUSES, n_customers, p=[0.75, 0.20, 0.05]),
+            categories=PAYMENT_STATUSES
         ),
-        'missed_payment_6m': np.random.poisson(0.3, n_customers),
-        'full_payment_ratio': np.random.beta(5, 2, n_customers) * 100
+        'missed_payment_6m': rng.poisson(0.3, n_customers),
+        'full_payment_ratio': rng.beta(5, 2, n_customers) * 100
     }
     
     df = pd.DataFrame(data)
-    df['avg_monthly_spending'] = (df['credit_limit'] * df['credit_utilization'] / 100).astype(int)
+    spending = (df['credit_limit'].to_numpy() * df['credit_utilization'].to_numpy() * 0.01).astype(int)
+    df['avg_monthly_spending'] = spending
     df['credit_utilization'] = df['credit_utilization'].clip(upper=100)
-    df['debt_to_income'] = (df['avg_monthly_spending'] / df['income'] * 100).round(2)
+    debt_to_income = np.empty(n_customers, dtype=np.float32)
+    np.divide(spending.astype(np.float32), df['income'].to_numpy(dtype=np.float32), out=debt_to_income)
+    np.multiply(debt_to_income, 100, out=debt_to_income)
+    np.round(debt_to_income, 2, out=debt_to_income)
+    df['debt_to_income'] = debt_to_income
     
     return df
 
-def calculate_risk_score(row):
-    """Calculate risk score using weighted methodology"""
-    score = 0
-    
-    # Credit Utilization (25%)
-    if row['credit_utilization'] < 30:
-        score += 5
-    elif row['credit_utilization'] < 60:
-        score += 15
-    else:
-        score += 25
-    
-    # Late Payment Count (30%)
-    if row['late_payment_count'] == 0:
-        score += 5
-    elif row['late_payment_count'] <= 2:
-        score += 20
-    else:
-        score += 30
-    
-    # Income Level (15%)
-    if row['income'] >= 10000000:
-        score += 3
-    elif row['income'] >= 5000000:
-        score += 10
-    else:
-        score += 15
-    
-    # Payment Status (20%)
-    if row['payment_status'] == 'Current':
-        score += 5
-    elif row['payment_status'] == 'Late':
-        score += 15
-    else:
-        score += 20
-    
-    # Missed Payments (10%)
-    if row['missed_payment_6m'] == 0:
-        score += 2
-    elif row['missed_payment_6m'] <= 2:
-        score += 7
-    else:
-        score += 10
-    
-    return min(score, 100)
-
-def categorize_risk(score):
-    """Categorize risk based on score"""
-    if score <= 33:
-        return 'Low Risk'
-    elif score <= 66:
-        return 'Medium Risk'
-    else:
-        return 'High Risk'
+@st.cache_data
+def build_scored_frame(n_customers=1000, seed=42, low_threshold=33, high_threshold=67):
+    """Generate customer data with risk scores and categories, plus an ID-indexed view"""
+    df = generate_customer_data(n_customers, seed)
+    df['risk_score'] = score_frame(df)
+    df['risk_category'] = categorize_risk(df['risk_score'], low_threshold, high_threshold)
+    
+    # Narrow dtypes halve the frame and the chart payloads sent to the browser
+    df = df.astype({
+        'late_payment_count': 'int16',
+        'missed_payment_6m': 'int8',
+        'income': 'int32',
+        'credit_limit': 'int32',
+        'avg_monthly_spending': 'int32',
+        'credit_utilization': 'float32',
+        'full_payment_ratio': 'float32',
+        'risk_score': 'int8'
+    })
+    
+    # Highest risk first, so any filtered view's top rows are its riskiest customers
+    df = df.sort_values('risk_score', ascending=False, kind='stable', ignore_index=True)
+    return df, df.set_index('customer_id', drop=False)
+
+CORR_FEATURES = ['age', 'income', 'credit_utilization', 'late_payment_count', 'risk_score']
+
+@st.cache_data
+def summarize(df):
+    """Portfolio-level aggregates shared by the KPI row and the tabs"""
+    summary = df.groupby('risk_category', observed=True)[
+        ['age', 'income', 'credit_utilization', 'late_payment_count', 'risk_score']
+    ].mean().round(2)
+    summary.columns = ['Avg Age', 'Avg Income', 'Avg Utilization %', 'Avg Late Payments', 'Avg Risk Score']
+    
+    # Computed in float32, handed to the heatmap as float64 so its rounded labels stay short
+    corr = np.corrcoef(
+        df[CORR_FEATURES].to_numpy(dtype=np.float32), rowvar=False, dtype=np.float32
+    ).astype(np.float64)
+    
+    cat_counts = df['risk_category'].value_counts()
+    cat_pct = cat_counts / max(len(df), 1) * 100
+    
+    return dict(
+        mean_score=df['risk_score'].mean(),
+        low_pct=cat_pct['Low Risk'],
+        high_pct=cat_pct['High Risk'],
+        avg_util=df['credit_utilization'].mean(),
+        summary=summary,
+        corr=corr,
+        cat_counts=cat_counts
+    )
+
+TOP_RISK_COLUMNS = ['customer_id', 'risk_score', 'credit_utilization', 'late_payment_count', 'payment_status']
+
+@st.cache_data
+def segment_stats(df, segment):
+    """Filtered aggregates for one risk segment ('All' for the whole portfolio)"""
+    sub = df if segment == 'All' else df[df['risk_category'] == segment]
+    return dict(
+        count=len(sub),
+        mean_score=sub['risk_score'].mean(),
+        mean_util=sub['credit_utilization'].mean(),
+        mean_late=sub['late_payment_count'].mean(),
+        top10=sub.head(10)[TOP_RISK_COLUMNS],  # df is pre-sorted by risk_score
+        emp_counts=sub['employment_status'].value_counts(),
+        ages=sub['age'].to_numpy()
+    )
+
+# ============================================================================
+# CHART BUILDERS
+# ============================================================================
+# Figures are cached as shared objects (st.cache_resource) so reruns reuse
+# them instead of rebuilding or unpickling; st.plotly_chart does not mutate them.
+# The cache is process-wide, so each builder keeps only its most recent figures.
+
+FIGURE_CACHE_ENTRIES = 32
+
+RISK_COLORS = {'Low Risk': '#2ecc71', 'Medium Risk': '#f39c12', 'High Risk': '#e74c3c'}
+
+def _histogram_bar(values, bins, **kwargs):
+    """Histogram binned server-side, so only the bin counts reach the browser"""
+    values = np.asarray(values)
+    if np.ndim(bins) == 0 and np.issubdtype(values.dtype, np.integer) and values.size:
+        # Bin count for integers: whole-number width on half-integer edges (given edges are kept)
+        lo, hi = int(values.min()), int(values.max())
+        width = max(1, -(-(hi - lo + 1) // bins))
+        bins = np.arange(lo, hi + width + 1, width) - 0.5
+    counts, edges = np.histogram(values, bins=bins)
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), **kwargs)
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_score_hist(df, mean_score):
+    """Risk score histogram with the portfolio mean marked"""
+    fig = go.Figure()
+    fig.add_trace(_histogram_bar(
+        df['risk_score'].to_numpy(),
+        30,
+        name='Risk Score',
+        marker_color='steelblue',
+        opacity=0.7
+    ))
+    fig.add_vline(
+        x=mean_score,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Mean: {mean_score:.1f}"
+    )
+    fig.update_layout(
+        title="Risk Score Distribution",
+        xaxis_title="Risk Score",
+        yaxis_title="Frequency",
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_risk_pie(risk_counts):
+    """Donut chart of customers per risk category"""
+    fig = go.Figure(data=[go.Pie(
+        labels=risk_counts.index,
+        values=risk_counts.values,
+        marker=dict(colors=[RISK_COLORS[category] for category in risk_counts.index]),
+        hole=0.4
+    )])
+    fig.update_layout(
+        title="Risk Category Distribution",
+        height=400
+    )
+    return fig
+
+SCATTER_MAX_POINTS = 1500
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_util_vs_score(df):
+    """Credit utilization against risk score (binned density for large portfolios)"""
+    if len(df) > SCATTER_MAX_POINTS:
+        # Bin server-side like _histogram_bar, so only the 40x40 grid is serialized
+        counts, x_edges, y_edges = np.histogram2d(
+            df['credit_utilization'].to_numpy(dtype=np.float32),
+            df['risk_score'].to_numpy(dtype=np.float32),
+            bins=40
+        )
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=counts.T,
+            colorscale='RdBu_r',
+            colorbar=dict(title='Customers')
+        ))
+        fig.update_layout(
+            title='Credit Utilization vs Risk Score',
+            xaxis_title='Credit Utilization (%)',
+            yaxis_title='Risk Score',
+            height=400
+        )
+        return fig
+    
+    fig = px.scatter(
+        df,
+        x='credit_utilization',
+        y='risk_score',
+        color='risk_category',
+        color_discrete_map=RISK_COLORS,
+        category_orders={'risk_category': RISK_CATEGORIES},
+        title='Credit Utilization vs Risk Score',
+        labels={'credit_utilization': 'Credit Utilization (%)', 'risk_score': 'Risk Score'}
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_category_box(df, column, title):
+    """Box plot of a column per risk category"""
+    fig = px.box(
+        df,
+        x='risk_category',
+        y=column,
+        color='risk_category',
+        color_discrete_map=RISK_COLORS,
+        category_orders={'risk_category': RISK_CATEGORIES},
+        title=title
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_correlation(corr, corr_features):
+    """Heatmap of a feature correlation matrix"""
+    fig = go.Figure(data=go.Heatmap(
+        z=corr,
+        x=corr_features,
+        y=corr_features,
+        colorscale='RdBu_r',
+        zmid=0,
+        text=corr.round(2),
+        texttemplate='%{text}',
+        textfont={"size": 10}
+    ))
+    fig.update_layout(height=500, title="Correlation Matrix")
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_income_hist(df):
+    """Overlaid income histograms per risk category"""
+    income = df['income'].to_numpy()
+    codes = df['risk_category'].cat.codes.to_numpy()
+    edges = np.histogram_bin_edges(income, bins=30)  # shared so the tiers overlay
+    
+    fig = go.Figure([
+        _histogram_bar(
+            income[codes == code],
+            edges,
+            name=category,
+            marker_color=RISK_COLORS[category],
+            opacity=0.7
+        )
+        for code, category in enumerate(df['risk_category'].cat.categories)
+    ])
+    fig.update_layout(
+        barmode='overlay',
+        title='Income Distribution by Risk Category',
+        xaxis_title='Income (IDR)',
+        yaxis_title='count',
+        legend_title_text='risk_category',
+        height=400
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_payment_status(df):
+    """Stacked bars of payment status split by risk category"""
+    # Grouping on both Categoricals counts over their codes; observed=False keeps
+    # every status/tier pair, so an empty tier still gets an (empty) trace
+    payment_risk = (
+        df.groupby(['payment_status', 'risk_category'], observed=False)
+        .size()
+        .unstack('risk_category', fill_value=0)
+    )
+    
+    fig = go.Figure([
+        go.Bar(
+            name=category,
+            x=payment_risk.index,
+            y=payment_risk[category],
+            marker_color=RISK_COLORS[category]
+        )
+        for category in payment_risk.columns
+    ])
+    fig.update_layout(
+        barmode='stack',
+        title='Payment Status vs Risk Category',
+        xaxis_title='Payment Status',
+        yaxis_title='Number of Customers',
+        height=400
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_segment_age(ages, segment):
+    """Age histogram for one risk segment"""
+    fig = go.Figure(_histogram_bar(ages, 20, marker_color='steelblue'))
+    fig.update_layout(
+        title=f'Age Distribution - {segment}',
+        xaxis_title='age',
+        yaxis_title='count',
+        height=350
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_segment_employment(employment_counts, segment):
+    """Employment status pie for one risk segment"""
+    fig = px.pie(
+        values=employment_counts.values,
+        names=employment_counts.index,
+        title=f'Employment Status - {segment}'
+    )
+    fig.update_layout(height=350)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def fig_risk_gauge(score, color, reference, low, high):
+    """Gauge of one customer's score against the portfolio mean"""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Risk Score", 'font': {'size': 24}},
+        delta={'reference': reference, 'increasing': {'color': "red"}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': color},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, low], 'color': '#d4edda'},
+                {'range': [low, high], 'color': '#fff3cd'},
+                {'range': [high, 100], 'color': '#f8d7da'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': high
+            }
+        }
+    ))
+    fig.update_layout(height=300)
+    return fig
+
+# ============================================================================
+# TAB FRAGMENTS
+# ============================================================================
+# Widgets inside a fragment only rerun the fragment, not the whole page.
+
+_RISK_TEXT_COLORS = {'Low Risk': 'green', 'Medium Risk': 'orange', 'High Risk': 'red'}
+
+_LOW_MSG = """
+✅ **Low Risk Customer - Maintain Good Standing**
+- Continue monitoring regular payment behavior
+- Consider for credit limit increase
+- Eligible for premium product offerings
+- Reward loyalty with benefits program
+"""
+
+_MED_MSG = """
+⚠️ **Medium Risk Customer - Enhanced Monitoring**
+- Send payment reminders before due dates
+- Monitor credit utilization closely
+- Offer financial literacy resources
+- Consider payment plan options if needed
+"""
+
+_HIGH_MSG = """
+🚨 **High Risk Customer - Intensive Review**
+- Immediate collections team review required
+- Freeze or reduce credit limit
+- Require collateral for new transactions
+- Implement strict payment monitoring
+- Consider account suspension if delinquent
+"""
+
+_REC = {'Low Risk': _LOW_MSG, 'Medium Risk': _MED_MSG, 'High Risk': _HIGH_MSG}
+_REC_BOX = {'Low Risk': st.success, 'Medium Risk': st.warning, 'High Risk': st.error}
+
+@st.fragment
+def segment_tab(df):
+    """Tab 4: segment selector, segment KPIs and charts"""
+    st.subheader("🎯 Segment Deep Dive")
+    
+    # Segment selector
+    selected_segment = st.selectbox(
+        "Select Risk Segment to Analyze:",
+        options=['All'] + RISK_CATEGORIES
+    )
+    
+    # Filter data
+    segment = segment_stats(df, selected_segment)
+    
+    # Segment metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Customers", f"{segment['count']:,}")
+    with col2:
+        st.metric("Avg Score", f"{segment['mean_score']:.1f}")
+    with col3:
+        st.metric("Avg Utilization", f"{segment['mean_util']:.1f}%")
+    with col4:
+        st.metric("Avg Late Payments", f"{segment['mean_late']:.2f}")
+    
+    # Segment characteristics
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Age distribution
+        st.plotly_chart(fig_segment_age(segment['ages'], selected_segment), use_container_width=True)
+    
+    with col2:
+        # Employment status
+        st.plotly_chart(fig_segment_employment(segment['emp_counts'], selected_segment), use_container_width=True)
+    
+    # Top risky customers in segment
+    st.subheader(f"⚠️ Top 10 Highest Risk Customers in {selected_segment}")
+    st.dataframe(segment['top10'], use_container_width=True)
+
+@st.fragment
+def lookup_tab(df_by_id, mean_score, low_threshold, high_threshold):
+    """Tab 5: single-customer card, gauge and recommendations"""
+    st.subheader("🔍 Individual Customer Lookup")
+    
+    # Customer ID input (IDs run CUST00001..CUSTnnnnn, so pick by number)
+    customer_number = st.number_input(
+        "Customer Number:",
+        min_value=1,
+        max_value=len(df_by_id),
+        value=1,
+        step=1
+    )
+    customer_id = f"CUST{int(customer_number):05d}"
+    
+    # Get customer data
+    customer = df_by_id.loc[customer_id]
+    
+    # Display customer card
+    col1, col2, col3 = st.columns([1, 1, 1])
+    
+    with col1:
+        st.markdown("### 👤 Customer Profile")
+        st.write(f"**Customer ID:** {customer['customer_id']}")
+        st.write(f"**Age:** {customer['age']} years")
+        st.write(f"**Income:** Rp {customer['income']:,.0f}")
+        st.write(f"**Employment:** {customer['employment_status']}")
+        st.write(f"**Dependents:** {customer['dependents']}")
+    
+    with col2:
+        st.markdown("### 💳 Credit Profile")
+        st.write(f"**Credit Limit:** Rp {customer['credit_limit']:,.0f}")
+        st.write(f"**Utilization:** {customer['credit_utilization']:.1f}%")
+        st.write(f"**Monthly Spending:** Rp {customer['avg_monthly_spending']:,.0f}")
+        st.write(f"**Account Age:** {customer['account_age_months']} months")
+    
+    with col3:
+        st.markdown("### 📊 Risk Assessment")
+    
+        # Risk score against the portfolio average; higher is worse
+        risk_color = _RISK_TEXT_COLORS[customer['risk_category']]
+        st.metric(
+            "Risk Score",
+            f"{customer['risk_score']:.0f}",
+            delta=f"{customer['risk_score'] - mean_score:+.1f} vs avg",
+            delta_color="inverse"
+        )
+        st.markdown(f"**Category:** :{risk_color}[**{customer['risk_category']}**]")
+        st.write(f"**Payment Status:** {customer['payment_status']}")
+        st.write(f"**Late Payments:** {customer['late_payment_count']}")
+        st.write(f"**Missed Payments (6m):** {customer['missed_payment_6m']}")
+    
+    # Risk gauge chart
+    st.markdown("### 🎯 Risk Score Gauge")
+    
+    st.plotly_chart(
+        fig_risk_gauge(customer['risk_score'], risk_color, mean_score,
+                       low_threshold, high_threshold),
+        use_container_width=True
+    )
+    
+    # Recommendations
+    st.markdown("### 💡 Recommendations")
+    
+    category = customer['risk_category']
+    _REC_BOX[category](_REC[category])
 
 # ============================================================================
 # MAIN APP
@@ -189,6 +592,7 @@ def main():
         # Generate data button
         if st.button("🔄 Generate New Data", type="primary"):
             st.cache_data.clear()
+            st.cache_resource.clear()
         
         st.markdown("---")
         st.subheader("📋 About")
@@ -202,9 +606,8 @@ def main():
     
     # Generate and process data
     with st.spinner("Generating customer data..."):
-        df = generate_customer_data(n_customers, seed)
-        df['risk_score'] = df.apply(calculate_risk_score, axis=1)
-        df['risk_category'] = df['risk_score'].apply(categorize_risk)
+        df, df_by_id = build_scored_frame(n_customers, seed, low_threshold, high_threshold)
+        stats = summarize(df)
     
     # ========================================================================
     # KPI METRICS
@@ -221,15 +624,14 @@ def main():
         )
     
     with col2:
-        avg_risk = df['risk_score'].mean()
         st.metric(
             label="Avg Risk Score",
-            value=f"{avg_risk:.1f}",
+            value=f"{stats['mean_score']:.1f}",
             delta=None
         )
     
     with col3:
-        low_risk_pct = (df['risk_category'] == 'Low Risk').sum() / len(df) * 100
+        low_risk_pct = stats['low_pct']
         st.metric(
             label="Low Risk %",
             value=f"{low_risk_pct:.1f}%",
@@ -237,7 +639,7 @@ def main():
         )
     
     with col4:
-        high_risk_pct = (df['risk_category'] == 'High Risk').sum() / len(df) * 100
+        high_risk_pct = stats['high_pct']
         st.metric(
             label="High Risk %",
             value=f"{high_risk_pct:.1f}%",
@@ -245,10 +647,9 @@ def main():
         )
     
     with col5:
-        avg_utilization = df['credit_utilization'].mean()
         st.metric(
             label="Avg Utilization",
-            value=f"{avg_utilization:.1f}%",
+            value=f"{stats['avg_util']:.1f}%",
             delta=None
         )
     
@@ -271,56 +672,15 @@ def main():
         
         with col1:
             # Risk Score Distribution
-            fig1 = go.Figure()
-            fig1.add_trace(go.Histogram(
-                x=df['risk_score'],
-                nbinsx=30,
-                name='Risk Score',
-                marker_color='steelblue',
-                opacity=0.7
-            ))
-            fig1.add_vline(
-                x=df['risk_score'].mean(),
-                line_dash="dash",
-                line_color="red",
-                annotation_text=f"Mean: {df['risk_score'].mean():.1f}"
-            )
-            fig1.update_layout(
-                title="Risk Score Distribution",
-                xaxis_title="Risk Score",
-                yaxis_title="Frequency",
-                showlegend=False,
-                height=400
-            )
-            st.plotly_chart(fig1, use_container_width=True)
+            st.plotly_chart(fig_score_hist(df, stats['mean_score']), use_container_width=True)
         
         with col2:
             # Risk Category Pie Chart
-            risk_counts = df['risk_category'].value_counts()
-            fig2 = go.Figure(data=[go.Pie(
-                labels=risk_counts.index,
-                values=risk_counts.values,
-                marker=dict(colors=['#2ecc71', '#f39c12', '#e74c3c']),
-                hole=0.4
-            )])
-            fig2.update_layout(
-                title="Risk Category Distribution",
-                height=400
-            )
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(fig_risk_pie(stats['cat_counts']), use_container_width=True)
         
         # Summary Statistics Table
         st.subheader("📋 Summary Statistics by Risk Category")
-        summary_stats = df.groupby('risk_category').agg({
-            'age': 'mean',
-            'income': 'mean',
-            'credit_utilization': 'mean',
-            'late_payment_count': 'mean',
-            'risk_score': 'mean'
-        }).round(2)
-        
-        summary_stats.columns = ['Avg Age', 'Avg Income', 'Avg Utilization %', 'Avg Late Payments', 'Avg Risk Score']
-        st.dataframe(summary_stats, use_container_width=True)
+        st.dataframe(stats['summary'], use_container_width=True)
     
     # TAB 2: RISK ANALYSIS
     with tab2:
@@ -328,48 +688,18 @@ def main():
         
         with col1:
             # Credit Utilization vs Risk Score
-            fig3 = px.scatter(
-                df,
-                x='credit_utilization',
-                y='risk_score',
-                color='risk_category',
-                color_discrete_map={'Low Risk': '#2ecc71', 'Medium Risk': '#f39c12', 'High Risk': '#e74c3c'},
-                title='Credit Utilization vs Risk Score',
-                labels={'credit_utilization': 'Credit Utilization (%)', 'risk_score': 'Risk Score'}
-            )
-            fig3.update_layout(height=400)
-            st.plotly_chart(fig3, use_container_width=True)
+            st.plotly_chart(fig_util_vs_score(df), use_container_width=True)
         
         with col2:
             # Late Payments Box Plot
-            fig4 = px.box(
-                df,
-                x='risk_category',
-                y='late_payment_count',
-                color='risk_category',
-                color_discrete_map={'Low Risk': '#2ecc71', 'Medium Risk': '#f39c12', 'High Risk': '#e74c3c'},
-                title='Late Payments by Risk Category'
+            st.plotly_chart(
+                fig_category_box(df, 'late_payment_count', 'Late Payments by Risk Category'),
+                use_container_width=True
             )
-            fig4.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig4, use_container_width=True)
         
         # Correlation Heatmap
         st.subheader("🔥 Feature Correlation Heatmap")
-        corr_features = ['age', 'income', 'credit_utilization', 'late_payment_count', 'risk_score']
-        corr_matrix = df[corr_features].corr()
-        
-        fig5 = go.Figure(data=go.Heatmap(
-            z=corr_matrix.values,
-            x=corr_features,
-            y=corr_features,
-            colorscale='RdBu_r',
-            zmid=0,
-            text=corr_matrix.values.round(2),
-            texttemplate='%{text}',
-            textfont={"size": 10}
-        ))
-        fig5.update_layout(height=500, title="Correlation Matrix")
-        st.plotly_chart(fig5, use_container_width=True)
+        st.plotly_chart(fig_correlation(stats['corr'], CORR_FEATURES), use_container_width=True)
     
     # TAB 3: FINANCIAL METRICS
     with tab3:
@@ -377,216 +707,26 @@ def main():
         
         with col1:
             # Income Distribution
-            fig6 = px.histogram(
-                df,
-                x='income',
-                color='risk_category',
-                color_discrete_map={'Low Risk': '#2ecc71', 'Medium Risk': '#f39c12', 'High Risk': '#e74c3c'},
-                title='Income Distribution by Risk Category',
-                labels={'income': 'Income (IDR)'},
-                barmode='overlay',
-                opacity=0.7
-            )
-            fig6.update_layout(height=400)
-            st.plotly_chart(fig6, use_container_width=True)
+            st.plotly_chart(fig_income_hist(df), use_container_width=True)
         
         with col2:
             # Debt to Income Ratio
-            fig7 = px.box(
-                df,
-                x='risk_category',
-                y='debt_to_income',
-                color='risk_category',
-                color_discrete_map={'Low Risk': '#2ecc71', 'Medium Risk': '#f39c12', 'High Risk': '#e74c3c'},
-                title='Debt-to-Income Ratio by Risk'
+            st.plotly_chart(
+                fig_category_box(df, 'debt_to_income', 'Debt-to-Income Ratio by Risk'),
+                use_container_width=True
             )
-            fig7.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig7, use_container_width=True)
         
         # Payment Status Analysis
         st.subheader("💳 Payment Status Analysis")
-        payment_risk = pd.crosstab(df['payment_status'], df['risk_category'])
-        
-        fig8 = go.Figure()
-        for category in ['Low Risk', 'Medium Risk', 'High Risk']:
-            fig8.add_trace(go.Bar(
-                name=category,
-                x=payment_risk.index,
-                y=payment_risk[category],
-                marker_color={'Low Risk': '#2ecc71', 'Medium Risk': '#f39c12', 'High Risk': '#e74c3c'}[category]
-            ))
-        
-        fig8.update_layout(
-            barmode='stack',
-            title='Payment Status vs Risk Category',
-            xaxis_title='Payment Status',
-            yaxis_title='Number of Customers',
-            height=400
-        )
-        st.plotly_chart(fig8, use_container_width=True)
+        st.plotly_chart(fig_payment_status(df), use_container_width=True)
     
     # TAB 4: CUSTOMER SEGMENTS
     with tab4:
-        st.subheader("🎯 Segment Deep Dive")
-        
-        # Segment selector
-        selected_segment = st.selectbox(
-            "Select Risk Segment to Analyze:",
-            options=['All', 'Low Risk', 'Medium Risk', 'High Risk']
-        )
-        
-        # Filter data
-        if selected_segment != 'All':
-            segment_df = df[df['risk_category'] == selected_segment]
-        else:
-            segment_df = df
-        
-        # Segment metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Customers", f"{len(segment_df):,}")
-        with col2:
-            st.metric("Avg Score", f"{segment_df['risk_score'].mean():.1f}")
-        with col3:
-            st.metric("Avg Utilization", f"{segment_df['credit_utilization'].mean():.1f}%")
-        with col4:
-            st.metric("Avg Late Payments", f"{segment_df['late_payment_count'].mean():.2f}")
-        
-        # Segment characteristics
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Age distribution
-            fig9 = px.histogram(
-                segment_df,
-                x='age',
-                nbins=20,
-                title=f'Age Distribution - {selected_segment}',
-                color_discrete_sequence=['steelblue']
-            )
-            fig9.update_layout(height=350)
-            st.plotly_chart(fig9, use_container_width=True)
-        
-        with col2:
-            # Employment status
-            employment_counts = segment_df['employment_status'].value_counts()
-            fig10 = px.pie(
-                values=employment_counts.values,
-                names=employment_counts.index,
-                title=f'Employment Status - {selected_segment}'
-            )
-            fig10.update_layout(height=350)
-            st.plotly_chart(fig10, use_container_width=True)
-        
-        # Top risky customers in segment
-        st.subheader(f"⚠️ Top 10 Highest Risk Customers in {selected_segment}")
-        top_risk = segment_df.nlargest(10, 'risk_score')[
-            ['customer_id', 'risk_score', 'credit_utilization', 'late_payment_count', 'payment_status']
-        ]
-        st.dataframe(top_risk, use_container_width=True)
+        segment_tab(df)
     
     # TAB 5: INDIVIDUAL LOOKUP
     with tab5:
-        st.subheader("🔍 Individual Customer Lookup")
-        
-        # Customer ID input
-        customer_id = st.selectbox(
-            "Select Customer ID:",
-            options=df['customer_id'].tolist()
-        )
-        
-        # Get customer data
-        customer = df[df['customer_id'] == customer_id].iloc[0]
-        
-        # Display customer card
-        col1, col2, col3 = st.columns([1, 1, 1])
-        
-        with col1:
-            st.markdown("### 👤 Customer Profile")
-            st.write(f"**Customer ID:** {customer['customer_id']}")
-            st.write(f"**Age:** {customer['age']} years")
-            st.write(f"**Income:** Rp {customer['income']:,.0f}")
-            st.write(f"**Employment:** {customer['employment_status']}")
-            st.write(f"**Dependents:** {customer['dependents']}")
-        
-        with col2:
-            st.markdown("### 💳 Credit Profile")
-            st.write(f"**Credit Limit:** Rp {customer['credit_limit']:,.0f}")
-            st.write(f"**Utilization:** {customer['credit_utilization']:.1f}%")
-            st.write(f"**Monthly Spending:** Rp {customer['avg_monthly_spending']:,.0f}")
-            st.write(f"**Account Age:** {customer['account_age_months']} months")
-        
-        with col3:
-            st.markdown("### 📊 Risk Assessment")
-            
-            # Risk score with color
-            risk_color = {'Low Risk': 'green', 'Medium Risk': 'orange', 'High Risk': 'red'}[customer['risk_category']]
-            st.markdown(f"**Risk Score:** <span style='font-size:24px; color:{risk_color}; font-weight:bold;'>{customer['risk_score']:.0f}</span>", unsafe_allow_html=True)
-            st.markdown(f"**Category:** <span style='color:{risk_color}; font-weight:bold;'>{customer['risk_category']}</span>", unsafe_allow_html=True)
-            st.write(f"**Payment Status:** {customer['payment_status']}")
-            st.write(f"**Late Payments:** {customer['late_payment_count']}")
-            st.write(f"**Missed Payments (6m):** {customer['missed_payment_6m']}")
-        
-        # Risk gauge chart
-        st.markdown("### 🎯 Risk Score Gauge")
-        
-        fig11 = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=customer['risk_score'],
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Risk Score", 'font': {'size': 24}},
-            delta={'reference': df['risk_score'].mean(), 'increasing': {'color': "red"}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                'bar': {'color': risk_color},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [0, 33], 'color': '#d4edda'},
-                    {'range': [33, 66], 'color': '#fff3cd'},
-                    {'range': [66, 100], 'color': '#f8d7da'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 66
-                }
-            }
-        ))
-        
-        fig11.update_layout(height=300)
-        st.plotly_chart(fig11, use_container_width=True)
-        
-        # Recommendations
-        st.markdown("### 💡 Recommendations")
-        
-        if customer['risk_category'] == 'Low Risk':
-            st.success("""
-            ✅ **Low Risk Customer - Maintain Good Standing**
-            - Continue monitoring regular payment behavior
-            - Consider for credit limit increase
-            - Eligible for premium product offerings
-            - Reward loyalty with benefits program
-            """)
-        elif customer['risk_category'] == 'Medium Risk':
-            st.warning("""
-            ⚠️ **Medium Risk Customer - Enhanced Monitoring**
-            - Send payment reminders before due dates
-            - Monitor credit utilization closely
-            - Offer financial literacy resources
-            - Consider payment plan options if needed
-            """)
-        else:
-            st.error("""
-            🚨 **High Risk Customer - Intensive Review**
-            - Immediate collections team review required
-            - Freeze or reduce credit limit
-            - Require collateral for new transactions
-            - Implement strict payment monitoring
-            - Consider account suspension if delinquent
-            """)
+        lookup_tab(df_by_id, stats['mean_score'], low_threshold, high_threshold)
     
     # ========================================================================
     # FOOTER
@@ -601,51 +741,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-```
-
----
-
-## 📝 CARA COPY & SAVE (CODE 2):
-
-### **Step 1: Copy Code**
-1. **Select semua** code di atas (Ctrl+A di dalam code box)
-2. **Copy** (Ctrl+C)
-
-### **Step 2: Paste ke Notepad**
-1. Buka **Notepad** baru
-2. **Paste** (Ctrl+V)
-
-### **Step 3: Save as .py File**
-1. **File** → **Save As**
-2. **File name:** `streamlit_dashboard.py`
-3. **Save as type:** **All Files (*.*)**
-4. **Save di:** `Desktop/upload-github/src/`
-5. Klik **Save**
-
----
-
-## ✅ Sekarang Anda Punya 2 Files Python:
-
-Di folder `src/`, seharusnya ada:
-- ✅ `risk_scoring_model.py` (file pertama)
-- ✅ `streamlit_dashboard.py` (file kedua)
-
----
-
-## 📦 RECAP: Semua Files yang Harus Ada
-
-Di folder `Desktop/upload-github/`:
-```
-upload-github/
-├── outputs/
-│   └── risk_scoring_dashboard.png       ← Dari Colab
-│
-├── data/
-│   └── customer_risk_scores.csv         ← Dari Colab
-│
-├── notebooks/
-│   └── Customer_Risk_Scoring_Model.ipynb ← Dari Colab
-│
-└── src/
-    ├── risk_scoring_model.py            ← CODE 1 (yang tadi)
-    └── streamlit_dashboard.py           ← CODE 2 (yang ini)
\ No newline at end of file